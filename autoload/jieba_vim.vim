@@ -0,0 +1,33 @@
+" Copyright 2024 Kaiwen Wu. All Rights Reserved.
+"
+" Licensed under the Apache License, Version 2.0 (the "License"); you may not
+" use this file except in compliance with the License. You may obtain a copy
+" of the License at
+"
+"     http://www.apache.org/licenses/LICENSE-2.0
+"
+" Unless required by applicable law or agreed to in writing, software
+" distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+" WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+" License for the specific language governing permissions and limitations
+" under the License.
+
+
+" Restore 'virtualedit' saved by jieba_vim.navigation before an
+" operator-pending motion, and remove the one-shot autocmds that call this
+" function.
+function! jieba_vim#reset_virtualedit() abort
+    execute 'set virtualedit=' . g:jieba_vim_previous_virtualedit
+    autocmd! jieba_vim_reset_virtualedit
+endfunction
+
+" Delete the current line after a `d` motion with d-special (see
+" jieba_vim.navigation), move the cursor to column {col} if it's positive,
+" and remove the one-shot autocmd that calls this function.
+function! jieba_vim#teardown_d_special(col) abort
+    normal! dd
+    if a:col > 0
+        silent call cursor(line('.'), a:col)
+    endif
+    autocmd! jieba_vim_teardown_d_special
+endfunction
@@ -47,28 +47,60 @@ These names are dynamically defined in this module::
     - omap_ge
     - omap_gE
 """
+import string
+
 import vim
 
 from . import jieba_vim_rs
 
 word_motion = None
 
-
-def upperbound_count(count):
-    """
-    Upperbound the count at 2**64-1. This assumes the use of u64 type for
-    count.
-    """
-    return min(18446744073709551615, count)
+_IS_NVIM = bool(int(vim.eval('has("nvim")')))
+
+# `vim.bindeval` is available in Vim but not in Neovim.
+_HAS_BINDEVAL = hasattr(vim, 'bindeval')
+
+# I tried `let s:jieba_vim_previous_virtualedit = &virtualedit` but got error
+# "Illegal variable name: s:jieba_vim_previous_virtualedit". Will the use of
+# global variable lead to race condition when there are multiple instances of
+# Vim open?
+_ONEMORE_EXPR = "&virtualedit =~# '\\v<(onemore|all)>'"
+_SAVE_VE = ('let g:jieba_vim_previous_virtualedit = &virtualedit '
+            '| if !(' + _ONEMORE_EXPR + ') '
+            '| set virtualedit=onemore '
+            '| endif')
+_RESTORE_VE = 'execute "set virtualedit=" . g:jieba_vim_previous_virtualedit'
+# `:autocmd` takes the rest of the line as its command, hence the `execute`,
+# without which `augroup END` would become part of the autocmd.
+_RESET_VE_AUGROUP = ('augroup jieba_vim_reset_virtualedit '
+                     '| autocmd! '
+                     '| execute "autocmd TextChanged,CursorMoved <buffer> '
+                     'call jieba_vim#reset_virtualedit()" '
+                     '| augroup END')
+# The `m>gv` trick reference:
+# https://github.com/svermeulen/vim-NotableFt/blob/01732102c1d8c7b7bd6e221329e37685aa4ab41a/plugin/NotableFt.vim#L32
+_TEARDOWN_X = 'execute "normal! m>" | ' + _RESTORE_VE + ' | normal! gv'
+# Teardown of d-special. Neovim in addition needs the cursor column (1-indexed)
+# before the motion to be restored; the column passed is 0 in Vim. The
+# `execute` is needed for the same reason as in `_RESET_VE_AUGROUP`.
+_D_SPECIAL_CURSOR_TPL = '''execute "silent call cursor(line('.'), %d)"'''
+_D_SPECIAL_AUGROUP_TPL = ('augroup jieba_vim_teardown_d_special '
+                          '| autocmd! '
+                          '| execute "autocmd TextChanged <buffer> '
+                          'call jieba_vim#teardown_d_special(%d)" '
+                          '| augroup END')
 
 
 def _init_word_motion():
     global word_motion
     if word_motion is not None:
         return
-    user_dict = vim.eval('g:jieba_vim_user_dict') or None
+    # `vim.vars` returns bytes for string values in Vim but str in Neovim.
+    user_dict = vim.vars.get('jieba_vim_user_dict') or None
+    if isinstance(user_dict, bytes):
+        user_dict = user_dict.decode('utf-8')
     try:
-        if int(vim.eval('g:jieba_vim_lazy')):
+        if int(vim.vars.get('jieba_vim_lazy', 0)):
             word_motion = jieba_vim_rs.LazyWordMotion(user_dict)
         else:
             word_motion = jieba_vim_rs.WordMotion(user_dict)
@@ -77,211 +109,186 @@ def _init_word_motion():
             user_dict))
 
 
-_init_word_motion()
-
-
-def _vim_wrapper_factory_n(motion_name):
-    fun_name = 'nmap_' + motion_name
-
-    def _motion_wrapper(count):
-        count = upperbound_count(count)
-        method = getattr(word_motion, fun_name)
-        output = method(vim.current.buffer, vim.current.window.cursor, count)
-        vim.current.window.cursor = output.cursor
-
-    return {fun_name: _motion_wrapper}
-
-
-def _vim_wrapper_factory_x(motion_name):
-    fun_name = 'xmap_' + motion_name
-
-    def _motion_wrapper(count):
-        count = upperbound_count(count)
-        method = getattr(word_motion, fun_name)
-        # I tried `let s:jieba_vim_previous_virtualedit = &virtualedit` but got
-        # error "Illegal variable name: s:jieba_vim_previous_virtualedit". Will
-        # the use of global variable lead to race condition when there are
-        # multiple instances of Vim open?
-        vim.command('let g:jieba_vim_previous_virtualedit = &virtualedit')
-        vim.command('set virtualedit=onemore')
-        # Handle the case where cursor is one character after the last
-        # character of the buffer in visual mode.
-        line = vim.current.window.cursor[0]
-        col_gt = int(vim.eval('''col("'>")''')) - 1
-        if col_gt >= len(vim.current.buffer[line - 1].encode('utf-8')):
-            output = method(vim.current.buffer, (line, col_gt), count)
-        else:
-            output = method(vim.current.buffer, vim.current.window.cursor,
-                            count)
-        vim.current.window.cursor = output.cursor
-
-    def _teardown_wrapper():
-        # The `m>gv` trick reference:
-        # https://github.com/svermeulen/vim-NotableFt/blob/01732102c1d8c7b7bd6e221329e37685aa4ab41a/plugin/NotableFt.vim#L32
-        vim.command('normal! m>')
-        vim.command(
-            'execute "set virtualedit=" . g:jieba_vim_previous_virtualedit')
-        vim.command('normal! gv')
+def get_word_motion():
+    """
+    Get the ``word_motion`` object, which is initialized on first use rather
+    than at import, so that startup doesn't pay for it.
+    """
+    if word_motion is None:
+        _init_word_motion()
+    return word_motion
 
-    return {
-        fun_name: _motion_wrapper,
-        'teardown_' + fun_name: _teardown_wrapper,
-    }
 
+def _eval_ints(expr):
+    """
+    Evaluate vimscript expression ``expr`` that yields a list of numbers, and
+    return an iterable of Python ints. With ``vim.bindeval``, the numbers are
+    returned as ints directly rather than as strings to be converted.
+    """
+    if _HAS_BINDEVAL:
+        return vim.bindeval(expr)
+    return map(int, vim.eval(expr))
 
-def _vim_wrapper_factory_omap_w(motion_name):
-    assert motion_name in ['w', 'W']
-    fun_name = 'omap_' + motion_name
 
-    def _motion_wrapper(operator, count):
-        count = upperbound_count(count)
-        method = getattr(word_motion, fun_name)
+def _set_omap_cursor(win, cursor):
+    """
+    Move the cursor of ``win`` to ``cursor`` in operator-pending mode. When
+    ``cursor`` is past the end of line and 'virtualedit' does not already
+    allow it, 'virtualedit' is set to "onemore" until the pending operator has
+    been applied; otherwise 'virtualedit' is left alone.
+    """
+    row, col = cursor
+    if (col < int(vim.eval('strlen(getline({}))'.format(row)))
+            or int(vim.eval(_ONEMORE_EXPR))):
+        win.cursor = cursor
+    else:
         # virtualedit trick reference:
         # https://github.com/svermeulen/vim-NotableFt/blob/01732102c1d8c7b7bd6e221329e37685aa4ab41a/plugin/NotableFt.vim#L242-L256
-        #
-        # I tried `let s:jieba_vim_previous_virtualedit = &virtualedit` but got
-        # error "Illegal variable name: s:jieba_vim_previous_virtualedit". Will
-        # the use of global variable lead to race condition when there are
-        # multiple instances of Vim open?
-        vim.command('let g:jieba_vim_previous_virtualedit = &virtualedit')
-        vim.command('set virtualedit=onemore')
-        output = method(vim.current.buffer, vim.current.window.cursor,
-                        operator, count)
-        vim.current.window.cursor = output.cursor
+        vim.command(_SAVE_VE)
+        win.cursor = cursor
+        vim.command(_RESET_VE_AUGROUP)
+
+
+# Source templates of the functions listed in the module docstring, where
+# ``$motion`` is substituted by the motion name (e.g. ``w``). Generating them
+# as top-level functions lets each call the method of ``word_motion`` by name,
+# without the closures and ``getattr`` of per-motion factories. The methods of
+# ``word_motion`` return ``(row, col, d_special, prevent_change)``.
+_NMAP_TEMPLATE = '''
+def nmap_$motion(count):
+    if word_motion is None:
+        _init_word_motion()
+    win = vim.current.window
+    row, col, _, _ = word_motion.nmap_$motion(vim.current.buffer, win.cursor,
+                                              count)
+    win.cursor = (row, col)
+'''
+
+_XMAP_TEMPLATE = '''
+def xmap_$motion(count):
+    if word_motion is None:
+        _init_word_motion()
+    vim.command(_SAVE_VE)
+    # Handle the case where cursor is one character after the last character
+    # of the buffer in visual mode.
+    win = vim.current.window
+    cur = win.cursor
+    line = cur[0]
+    # `strlen()` counts bytes, so the line need not be copied to Python.
+    col_gt, line_bytes = _eval_ints(
+        \'\'\'[col("'>") - 1, strlen(getline({}))]\'\'\'.format(line))
+    if col_gt >= line_bytes:
+        cur = (line, col_gt)
+    row, col, _, _ = word_motion.xmap_$motion(vim.current.buffer, cur, count)
+    win.cursor = (row, col)
+
+
+def teardown_xmap_$motion():
+    vim.command(_TEARDOWN_X)
+'''
+
+_OMAP_W_TEMPLATE = '''
+def omap_$motion(operator, count):
+    if word_motion is None:
+        _init_word_motion()
+    win = vim.current.window
+    row, col, _, _ = word_motion.omap_$motion(vim.current.buffer, win.cursor,
+                                              operator, count)
+    _set_omap_cursor(win, (row, col))
+'''
+
+_OMAP_E_TEMPLATE = '''
+def omap_$motion(operator, count):
+    if word_motion is None:
+        _init_word_motion()
+    win = vim.current.window
+    cur = win.cursor
+    row, col, d_special, _ = word_motion.omap_$motion(
+        vim.current.buffer, cur, operator, count)
+    col_before = cur[1]
+    _set_omap_cursor(win, (row, col))
+    # This patch breaks `.` (see https://vimhelp.org/repeat.txt.html#.). Need
+    # help on fixing this issue.
+    if operator == 'd' and d_special:
+        vim.command(_D_SPECIAL_AUGROUP_TPL %
+                    (col_before + 1 if _IS_NVIM else 0))
+'''
+
+_OMAP_B_TEMPLATE = '''
+def omap_$motion(operator, count):
+    if word_motion is None:
+        _init_word_motion()
+    win = vim.current.window
+    row, col, _, prevent_change = word_motion.omap_$motion(
+        vim.current.buffer, win.cursor, count)
+    if prevent_change:
+        win.cursor = (row, col)
+    else:
+        # `col + 1` because vim column starts from 1 whereas vim python api
+        # column starts from 0.
         vim.command(
-            'augroup jieba_vim_reset_virtualedit '
-            '| autocmd! '
-            '| autocmd TextChanged,CursorMoved <buffer> '
-            'execute "set virtualedit=" . g:jieba_vim_previous_virtualedit '
-            '| autocmd! jieba_vim_reset_virtualedit '
-            '| augroup END')
-
-    return {fun_name: _motion_wrapper}
-
-
-def _vim_wrapper_factory_omap_e(motion_name):
-    assert motion_name in ['e', 'E']
-    fun_name = 'omap_' + motion_name
-
-    def _motion_wrapper(operator, count):
-        count = upperbound_count(count)
-        method = getattr(word_motion, fun_name)
-        # virtualedit trick reference:
-        # https://github.com/svermeulen/vim-NotableFt/blob/01732102c1d8c7b7bd6e221329e37685aa4ab41a/plugin/NotableFt.vim#L242-L256
-        #
-        # I tried `let s:jieba_vim_previous_virtualedit = &virtualedit` but got
-        # error "Illegal variable name: s:jieba_vim_previous_virtualedit". Will
-        # the use of global variable lead to race condition when there are
-        # multiple instances of Vim open?
-        vim.command('let g:jieba_vim_previous_virtualedit = &virtualedit')
-        vim.command('set virtualedit=onemore')
-        output = method(vim.current.buffer, vim.current.window.cursor,
-                        operator, count)
-        col_before = vim.current.window.cursor[1]
-        vim.current.window.cursor = output.cursor
+            'execute "silent normal! {}:call cursor({}, {})\\\\<CR>"'.format(
+                operator, row, col + 1))
+        if operator == 'c':
+            # Running `c` in `normal!` as above will shift the cursor one more
+            # character to the left; so we need to shift back one character.
+            if col > 0:
+                vim.command('normal! l')
+            vim.command('startinsert')
+'''
+
+_OMAP_GE_TEMPLATE = '''
+def omap_$motion(operator, count):
+    if word_motion is None:
+        _init_word_motion()
+    win = vim.current.window
+    cur = win.cursor
+    row, col, d_special, prevent_change = word_motion.omap_$motion(
+        vim.current.buffer, cur, operator, count)
+    col_before = cur[1]
+    if prevent_change:
+        win.cursor = (row, col)
+    else:
+        # `col + 1` because vim column starts from 1 whereas vim python api
+        # column starts from 0.
         vim.command(
-            'augroup jieba_vim_reset_virtualedit '
-            '| autocmd! '
-            '| autocmd TextChanged,CursorMoved <buffer> '
-            'execute "set virtualedit=" . g:jieba_vim_previous_virtualedit '
-            '| autocmd! jieba_vim_reset_virtualedit '
-            '| augroup END')
+            'execute "silent normal! {}v:call cursor({}, {})\\\\<CR>"'.format(
+                operator, row, col + 1))
+        if operator == 'c':
+            # Running `c` in `normal!` as above will shift the cursor one more
+            # character to the left; so we need to shift back one character.
+            if col > 0:
+                vim.command('normal! l')
+            vim.command('startinsert')
         # This patch breaks `.` (see https://vimhelp.org/repeat.txt.html#.).
         # Need help on fixing this issue.
-        if operator == 'd' and output.d_special:
-            if int(vim.eval('has("nvim")')):
-                vim.command(
-                    'augroup jieba_vim_teardown_d_special '
-                    '| autocmd! '
-                    '| autocmd TextChanged <buffer> execute "normal! dd" | execute "silent call cursor(line(\'.\'), {})" '
-                    '| autocmd! jieba_vim_teardown_d_special '
-                    '| augroup END'.format(col_before + 1))
-            else:
-                vim.command(
-                    'augroup jieba_vim_teardown_d_special '
-                    '| autocmd! '
-                    '| autocmd TextChanged <buffer> execute "normal! dd" '
-                    '| autocmd! jieba_vim_teardown_d_special '
-                    '| augroup END')
-
-    return {fun_name: _motion_wrapper}
-
-
-def _vim_wrapper_factory_omap_b(motion_name):
-    assert motion_name in ['b', 'B']
-    fun_name = 'omap_' + motion_name
-
-    def _motion_wrapper(operator, count):
-        count = upperbound_count(count)
-        method = getattr(word_motion, fun_name)
-        output = method(vim.current.buffer, vim.current.window.cursor, count)
-        if output.prevent_change:
-            vim.current.window.cursor = output.cursor
-        else:
-            # `output.cursor[1] + 1` because vim column starts from 1 whereas
-            # vim python api column starts from 0.
-            vim.command(
-                'execute "silent normal! {}:call cursor({}, {})\\<CR>"'.format(
-                    operator, output.cursor[0], output.cursor[1] + 1))
-            if operator == 'c':
-                # Running `c` in `normal!` as above will shift the cursor one more
-                # character to the left; so we need to shift back one character.
-                if output.cursor[1] > 0:
-                    vim.command('normal! l')
-                vim.command('startinsert')
-
-    return {fun_name: _motion_wrapper}
-
-
-def _vim_wrapper_factory_omap_ge(motion_name):
-    assert motion_name in ['ge', 'gE']
-    fun_name = 'omap_' + motion_name
-
-    def _motion_wrapper(operator, count):
-        count = upperbound_count(count)
-        method = getattr(word_motion, fun_name)
-        output = method(vim.current.buffer, vim.current.window.cursor,
-                        operator, count)
-        col_before = vim.current.window.cursor[1]
-        if output.prevent_change:
-            vim.current.window.cursor = output.cursor
-        else:
-            # `output.cursor[1] + 1` because vim column starts from 1 whereas
-            # vim python api column starts from 0.
-            vim.command(
-                'execute "silent normal! {}v:call cursor({}, {})\\<CR>"'
-                .format(operator, output.cursor[0], output.cursor[1] + 1))
-            if operator == 'c':
-                # Running `c` in `normal!` as above will shift the cursor one
-                # more character to the left; so we need to shift back one
-                # character.
-                if output.cursor[1] > 0:
-                    vim.command('normal! l')
-                vim.command('startinsert')
-            # This patch breaks `.` (see https://vimhelp.org/repeat.txt.html#.).
-            # Need help on fixing this issue.
-            elif operator == 'd' and output.d_special:
-                vim.command('normal! dd')
-                if int(vim.eval('has("nvim")')):
-                    vim.command(
-                        '''execute "silent call cursor(line('.'), {})"'''
-                        .format(col_before + 1))
-
-    return {fun_name: _motion_wrapper}
+        elif operator == 'd' and d_special:
+            vim.command('normal! dd')
+            if _IS_NVIM:
+                vim.command(_D_SPECIAL_CURSOR_TPL % (col_before + 1))
+'''
+
+
+# Pairs of motion name and the template of its operator-pending function.
+_OMAP_TEMPLATES = (
+    ('w', _OMAP_W_TEMPLATE),
+    ('W', _OMAP_W_TEMPLATE),
+    ('e', _OMAP_E_TEMPLATE),
+    ('E', _OMAP_E_TEMPLATE),
+    ('b', _OMAP_B_TEMPLATE),
+    ('B', _OMAP_B_TEMPLATE),
+    ('ge', _OMAP_GE_TEMPLATE),
+    ('gE', _OMAP_GE_TEMPLATE),
+)
 
 
 def _define_functions():
-    for mo in ['w', 'W', 'e', 'E', 'b', 'B', 'ge', 'gE']:
-        globals().update(_vim_wrapper_factory_n(mo))
-        globals().update(_vim_wrapper_factory_x(mo))
-        if mo in ['e', 'E']:
-            globals().update(_vim_wrapper_factory_omap_e(mo))
-        elif mo in ['b', 'B']:
-            globals().update(_vim_wrapper_factory_omap_b(mo))
-        elif mo in ['ge', 'gE']:
-            globals().update(_vim_wrapper_factory_omap_ge(mo))
-        else:
-            globals().update(_vim_wrapper_factory_omap_w(mo))
+    # All functions are compiled from one source, in a single `exec`.
+    source = ''.join(
+        string.Template(tpl).substitute(motion=mo)
+        for mo, omap_tpl in _OMAP_TEMPLATES
+        for tpl in (_NMAP_TEMPLATE, _XMAP_TEMPLATE, omap_tpl))
+    exec(source, globals())
 
 
 _define_functions()
@@ -14,8 +14,6 @@
 
 import vim
 
-PREVIEW_MAX_LIMIT = 99999
-
 
 def preview_cancel():
     vim.command('hi clear JiebaPreview')
@@ -26,15 +24,14 @@ def get_preview_limit():
     g:jieba_vim_preview_limits (int) is used to set the number of positions to
     highlight. When positive, preview that many positions. When zero, preview
     as many positions but limited to current line. When negative, prevew at
-    most ``preview_max_limit`` (99999) positions. Default to zero.
+    most ``preview_max_limit`` (99999) positions. Default to zero. The limit
+    is returned as is; it's capped at ``preview_max_limit`` by the preview
+    functions of ``jieba_vim.jieba_vim_rs``.
     """
     try:
-        limit = int(vim.eval('get(g:, "jieba_vim_preview_limits", 0)'))
-    except ValueError:
-        limit = 0
-    if limit < 0:
-        limit = PREVIEW_MAX_LIMIT
-    return min(limit, PREVIEW_MAX_LIMIT)
+        return int(vim.vars.get('jieba_vim_preview_limits', 0))
+    except (TypeError, ValueError):
+        return 0
 
 
 def preview(preview_func):
@@ -42,16 +39,15 @@ def preview(preview_func):
     Preview corresponding navigation.
 
     :param preview_func: a function from ``jieba_vim.jieba_vim_rs`` module of
-           signature ``(buffer, cursor_pos, limit) -> list[cursor_pos]``.
+           signature ``(buffer, cursor_pos, limit) -> str``, which returns the
+           match pattern of the positions to highlight, or an empty string if
+           there's none.
     """
-    vim.command('hi link JiebaPreview IncSearch')
     limit = get_preview_limit()
-    cursor_positions = preview_func(vim.current.buffer,
-                                    vim.current.window.cursor, limit)
-    if cursor_positions:
-        # build match pattern if there's any positions to highlight
-        match_pat = '|'.join('%{}c%{}l'.format(col + 1, row)
-                             for row, col in cursor_positions)
-        vim.command('match JiebaPreview /\\v{}/'.format(match_pat))
+    match_pat = preview_func(vim.current.buffer, vim.current.window.cursor,
+                             limit)
+    if match_pat:
+        vim.command('hi link JiebaPreview IncSearch '
+                    '| match JiebaPreview /\\v{}/'.format(match_pat))
     else:
         preview_cancel()
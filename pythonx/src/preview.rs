@@ -12,8 +12,13 @@
 // License for the specific language governing permissions and limitations
 // under the License.
 
+use std::fmt::Write;
+
 use jieba_vim_rs_core::motion::BufferLike;
 
+/// The maximum number of positions to preview.
+pub const PREVIEW_MAX_LIMIT: usize = 99999;
+
 /// Construct highlight positions. `motion1` should be a one-step motion
 /// function. `cursor_pos` is the current cursor position. To preview current
 /// line only, `preview_limit` should be zero; otherwise positive.
@@ -55,3 +60,18 @@ where
 
     Ok(positions)
 }
+
+/// Format highlight positions as a Vim regex pattern (very magic) matching
+/// any of them, e.g. `%3c%1l|%9c%1l`. The 0-indexed byte column of each
+/// position is converted to Vim's 1-indexed column.
+pub fn to_match_pattern(positions: &[(usize, usize)]) -> String {
+    // Each position takes roughly `%{col}c%{row}l|`.
+    let mut pattern = String::with_capacity(positions.len() * 12);
+    for (i, (row, col)) in positions.iter().enumerate() {
+        if i > 0 {
+            pattern.push('|');
+        }
+        write!(pattern, "%{}c%{}l", col + 1, row).unwrap();
+    }
+    pattern
+}
@@ -12,23 +12,36 @@
 // License for the specific language governing permissions and limitations
 // under the License.
 
-use std::cell::RefCell;
+use std::cell::{Cell, RefCell};
+use std::collections::HashMap;
 use std::fs::File;
 use std::io::BufReader;
 
 use jieba_rs::Jieba;
 use jieba_vim_rs_core::motion::{BufferLike, MotionOutput, WordMotion};
 use jieba_vim_rs_core::token::JiebaPlaceholder;
-use pyo3::exceptions::{PyIOError, PyValueError};
+use pyo3::exceptions::{PyIOError, PyOverflowError, PyValueError};
 use pyo3::prelude::*;
 
 use crate::preview;
 
-struct BoundWrapper<'b, 'py, T>(&'b Bound<'py, T>);
+/// A Python buffer object viewed as [`BufferLike`]. Fetched lines and the
+/// line count are memoized, so that each line crosses the Python boundary at
+/// most once during a motion (or a preview, which runs many motions in a
+/// row).
+struct BoundWrapper<'b, 'py, T> {
+    buffer: &'b Bound<'py, T>,
+    lines: Cell<Option<usize>>,
+    cached_lines: RefCell<HashMap<usize, String>>,
+}
 
 impl<'b, 'py, T> From<&'b Bound<'py, T>> for BoundWrapper<'b, 'py, T> {
     fn from(value: &'b Bound<'py, T>) -> Self {
-        Self(value)
+        Self {
+            buffer: value,
+            lines: Cell::new(None),
+            cached_lines: RefCell::new(HashMap::new()),
+        }
     }
 }
 
@@ -36,11 +49,21 @@ impl<'b, 'py> BufferLike for BoundWrapper<'b, 'py, PyAny> {
     type Error = PyErr;
 
     fn getline(&self, lnum: usize) -> Result<String, Self::Error> {
-        Ok(self.0.get_item(lnum - 1)?.extract::<String>()?)
+        if let Some(line) = self.cached_lines.borrow().get(&lnum) {
+            return Ok(line.clone());
+        }
+        let line = self.buffer.get_item(lnum - 1)?.extract::<String>()?;
+        self.cached_lines.borrow_mut().insert(lnum, line.clone());
+        Ok(line)
     }
 
     fn lines(&self) -> Result<usize, Self::Error> {
-        Ok(self.0.len()?)
+        if let Some(lines) = self.lines.get() {
+            return Ok(lines);
+        }
+        let lines = self.buffer.len()?;
+        self.lines.set(Some(lines));
+        Ok(lines)
     }
 }
 
@@ -72,28 +95,58 @@ impl JiebaPlaceholder for LazyJiebaWrapper {
     }
 }
 
-#[pyclass]
-#[pyo3(name = "MotionOutput")]
-pub struct MotionOutputWrapper(MotionOutput);
-
-#[pymethods]
-impl MotionOutputWrapper {
-    #[getter]
-    pub fn cursor(&self) -> (usize, usize) {
-        self.0.new_cursor_pos
+/// Motion count. Positive Python ints too large for `u64` saturate at
+/// `u64::MAX` rather than raising `OverflowError`. Negative ints raise
+/// `ValueError`.
+pub struct Count(u64);
+
+impl<'py> FromPyObject<'py> for Count {
+    fn extract_bound(ob: &Bound<'py, PyAny>) -> PyResult<Self> {
+        match ob.extract::<u64>() {
+            Ok(count) => Ok(Count(count)),
+            Err(err) if err.is_instance_of::<PyOverflowError>(ob.py()) => {
+                if ob.lt(0)? {
+                    Err(PyValueError::new_err("count must not be negative"))
+                } else {
+                    Ok(Count(u64::MAX))
+                }
+            }
+            Err(err) => Err(err),
+        }
     }
+}
 
-    #[getter]
-    pub fn d_special(&self) -> bool {
-        self.0.d_special
-    }
+/// Number of positions to preview. Zero means the current line only.
+/// Negative ints mean [`preview::PREVIEW_MAX_LIMIT`] positions, and larger
+/// ints saturate at it.
+pub struct PreviewLimit(usize);
 
-    #[getter]
-    pub fn prevent_change(&self) -> bool {
-        self.0.prevent_change
+impl<'py> FromPyObject<'py> for PreviewLimit {
+    fn extract_bound(ob: &Bound<'py, PyAny>) -> PyResult<Self> {
+        let limit = match ob.extract::<i64>() {
+            Ok(limit) if limit >= 0 => {
+                (limit as u64).min(preview::PREVIEW_MAX_LIMIT as u64) as usize
+            }
+            Ok(_) => preview::PREVIEW_MAX_LIMIT,
+            Err(err) if err.is_instance_of::<PyOverflowError>(ob.py()) => {
+                preview::PREVIEW_MAX_LIMIT
+            }
+            Err(err) => return Err(err),
+        };
+        Ok(PreviewLimit(limit))
     }
 }
 
+/// [`MotionOutput`] as returned to Python, i.e.
+/// `(row, col, d_special, prevent_change)`, which unpacks without attribute
+/// access.
+type MotionOutputTuple = (usize, usize, bool, bool);
+
+fn to_tuple(output: MotionOutput) -> MotionOutputTuple {
+    let (row, col) = output.new_cursor_pos;
+    (row, col, output.d_special, output.prevent_change)
+}
+
 #[pyclass]
 #[pyo3(name = "WordMotion")]
 pub struct WordMotionWrapper {
@@ -127,12 +180,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_w(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_w(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -142,12 +195,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_w(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_w(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -156,12 +209,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_w(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_w(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -171,12 +224,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_w(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_w(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -186,20 +239,20 @@ impl WordMotionWrapper {
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
         operator: &str,
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
         if operator == "c" {
-            Ok(MotionOutputWrapper(self.wm.omap_c_w(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_c_w(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 true,
             )?))
         } else {
-            Ok(MotionOutputWrapper(self.wm.omap_w(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_w(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 true,
             )?))
         }
@@ -211,20 +264,20 @@ impl WordMotionWrapper {
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
         operator: &str,
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
         if operator == "c" {
-            Ok(MotionOutputWrapper(self.wm.omap_c_w(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_c_w(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 false,
             )?))
         } else {
-            Ok(MotionOutputWrapper(self.wm.omap_w(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_w(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 false,
             )?))
         }
@@ -234,12 +287,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_e(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_e(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -249,12 +302,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_e(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_e(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -263,12 +316,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_e(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_e(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -278,12 +331,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_e(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_e(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -293,20 +346,20 @@ impl WordMotionWrapper {
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
         operator: &str,
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
         if operator == "d" {
-            Ok(MotionOutputWrapper(self.wm.omap_d_e(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_d_e(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 true,
             )?))
         } else {
-            Ok(MotionOutputWrapper(self.wm.omap_e(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_e(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 true,
             )?))
         }
@@ -318,20 +371,20 @@ impl WordMotionWrapper {
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
         operator: &str,
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
         if operator == "d" {
-            Ok(MotionOutputWrapper(self.wm.omap_d_e(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_d_e(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 false,
             )?))
         } else {
-            Ok(MotionOutputWrapper(self.wm.omap_e(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_e(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 false,
             )?))
         }
@@ -341,12 +394,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_b(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_b(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -356,12 +409,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_b(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_b(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -370,12 +423,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_b(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_b(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -385,12 +438,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_b(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_b(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -399,12 +452,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.omap_b(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.omap_b(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -414,12 +467,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.omap_b(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.omap_b(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -428,12 +481,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_ge(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_ge(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -443,12 +496,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_ge(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_ge(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -457,12 +510,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_ge(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_ge(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -472,12 +525,12 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_ge(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_ge(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -487,20 +540,20 @@ impl WordMotionWrapper {
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
         operator: &str,
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
         if operator == "d" {
-            Ok(MotionOutputWrapper(self.wm.omap_d_ge(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_d_ge(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 true,
             )?))
         } else {
-            Ok(MotionOutputWrapper(self.wm.omap_ge(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_ge(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 true,
             )?))
         }
@@ -512,20 +565,20 @@ impl WordMotionWrapper {
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
         operator: &str,
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
         if operator == "d" {
-            Ok(MotionOutputWrapper(self.wm.omap_d_ge(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_d_ge(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 false,
             )?))
         } else {
-            Ok(MotionOutputWrapper(self.wm.omap_ge(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_ge(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 false,
             )?))
         }
@@ -535,14 +588,15 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_w(b, c, 1, true)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 
     #[allow(non_snake_case)]
@@ -550,28 +604,30 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_w(b, c, 1, false)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 
     pub fn preview_nmap_e(
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_e(b, c, 1, true)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 
     #[allow(non_snake_case)]
@@ -579,28 +635,30 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_e(b, c, 1, false)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 
     pub fn preview_nmap_b(
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_b(b, c, 1, true)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 
     #[allow(non_snake_case)]
@@ -608,28 +666,30 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_b(b, c, 1, false)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 
     pub fn preview_nmap_ge(
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_ge(b, c, 1, true)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 
     #[allow(non_snake_case)]
@@ -637,14 +697,15 @@ impl WordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_ge(b, c, 1, false)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 }
 
@@ -675,12 +736,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_w(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_w(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -690,12 +751,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_w(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_w(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -704,12 +765,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_w(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_w(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -719,12 +780,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_w(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_w(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -734,20 +795,20 @@ impl LazyWordMotionWrapper {
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
         operator: &str,
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
         if operator == "c" {
-            Ok(MotionOutputWrapper(self.wm.omap_c_w(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_c_w(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 true,
             )?))
         } else {
-            Ok(MotionOutputWrapper(self.wm.omap_w(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_w(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 true,
             )?))
         }
@@ -759,20 +820,20 @@ impl LazyWordMotionWrapper {
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
         operator: &str,
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
         if operator == "c" {
-            Ok(MotionOutputWrapper(self.wm.omap_c_w(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_c_w(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 false,
             )?))
         } else {
-            Ok(MotionOutputWrapper(self.wm.omap_w(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_w(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 false,
             )?))
         }
@@ -782,12 +843,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_e(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_e(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -797,12 +858,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_e(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_e(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -811,12 +872,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_e(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_e(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -826,12 +887,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_e(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_e(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -841,20 +902,20 @@ impl LazyWordMotionWrapper {
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
         operator: &str,
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
         if operator == "d" {
-            Ok(MotionOutputWrapper(self.wm.omap_d_e(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_d_e(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 true,
             )?))
         } else {
-            Ok(MotionOutputWrapper(self.wm.omap_e(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_e(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 true,
             )?))
         }
@@ -866,20 +927,20 @@ impl LazyWordMotionWrapper {
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
         operator: &str,
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
         if operator == "d" {
-            Ok(MotionOutputWrapper(self.wm.omap_d_e(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_d_e(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 false,
             )?))
         } else {
-            Ok(MotionOutputWrapper(self.wm.omap_e(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_e(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 false,
             )?))
         }
@@ -889,12 +950,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_b(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_b(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -904,12 +965,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_b(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_b(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -918,12 +979,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_b(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_b(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -933,12 +994,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_b(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_b(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -947,12 +1008,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.omap_b(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.omap_b(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -962,12 +1023,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.omap_b(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.omap_b(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -976,12 +1037,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_ge(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_ge(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -991,12 +1052,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.nmap_ge(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.nmap_ge(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -1005,12 +1066,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_ge(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_ge(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             true,
         )?))
     }
@@ -1020,12 +1081,12 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
-        Ok(MotionOutputWrapper(self.wm.xmap_ge(
-            &BoundWrapper(buffer),
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
+        Ok(to_tuple(self.wm.xmap_ge(
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            count,
+            count.0,
             false,
         )?))
     }
@@ -1035,20 +1096,20 @@ impl LazyWordMotionWrapper {
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
         operator: &str,
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
         if operator == "d" {
-            Ok(MotionOutputWrapper(self.wm.omap_d_ge(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_d_ge(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 true,
             )?))
         } else {
-            Ok(MotionOutputWrapper(self.wm.omap_ge(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_ge(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 true,
             )?))
         }
@@ -1060,20 +1121,20 @@ impl LazyWordMotionWrapper {
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
         operator: &str,
-        count: u64,
-    ) -> PyResult<MotionOutputWrapper> {
+        count: Count,
+    ) -> PyResult<MotionOutputTuple> {
         if operator == "d" {
-            Ok(MotionOutputWrapper(self.wm.omap_d_ge(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_d_ge(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 false,
             )?))
         } else {
-            Ok(MotionOutputWrapper(self.wm.omap_ge(
-                &BoundWrapper(buffer),
+            Ok(to_tuple(self.wm.omap_ge(
+                &BoundWrapper::from(buffer),
                 cursor_pos,
-                count,
+                count.0,
                 false,
             )?))
         }
@@ -1083,14 +1144,15 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_w(b, c, 1, true)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 
     #[allow(non_snake_case)]
@@ -1098,28 +1160,30 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_w(b, c, 1, false)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 
     pub fn preview_nmap_e(
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_e(b, c, 1, true)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 
     #[allow(non_snake_case)]
@@ -1127,28 +1191,30 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_e(b, c, 1, false)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 
     pub fn preview_nmap_b(
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_b(b, c, 1, true)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 
     #[allow(non_snake_case)]
@@ -1156,28 +1222,30 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_b(b, c, 1, false)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 
     pub fn preview_nmap_ge(
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_ge(b, c, 1, true)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 
     #[allow(non_snake_case)]
@@ -1185,13 +1253,14 @@ impl LazyWordMotionWrapper {
         &self,
         buffer: &Bound<'_, PyAny>,
         cursor_pos: (usize, usize),
-        preview_limit: usize,
-    ) -> PyResult<Vec<(usize, usize)>> {
-        preview::preview(
+        preview_limit: PreviewLimit,
+    ) -> PyResult<String> {
+        let positions = preview::preview(
             |b, c| Ok(self.wm.nmap_ge(b, c, 1, false)?.new_cursor_pos),
-            &BoundWrapper(buffer),
+            &BoundWrapper::from(buffer),
             cursor_pos,
-            preview_limit,
-        )
+            preview_limit.0,
+        )?;
+        Ok(preview::to_match_pattern(&positions))
     }
 }
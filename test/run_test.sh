@@ -3,7 +3,7 @@
 source ../venv/bin/activate
 pip install -q -r requirements.txt
 echo "=== vim integration tests ==="
-VIM_BIN_NAME=vim pytest
+VIM_BIN_NAME=vim pytest -n auto --dist loadgroup
 echo
 echo "=== nvim integration tests ==="
-VIM_BIN_NAME=nvim pytest
+VIM_BIN_NAME=nvim pytest -n auto --dist loadgroup
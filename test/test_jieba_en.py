@@ -4,189 +4,191 @@ Property-based integration tests based on junegunn/vader.vim
 """
 
 import os
-import typing as ty
-import contextlib
-import uuid
+import atexit
+import functools
+import itertools
+import shutil
+import tempfile
+import time
 from pathlib import Path
 import subprocess
 
 import hypothesis
 from hypothesis import strategies as st
-
-Path('cases').mkdir(exist_ok=True, parents=False)
-
-
-def the_strategy():
-    paragraph_st = st.lists(st.sampled_from(['a', ',', ' ', '\n']), min_size=1)
+import pytest
+
+VIM_BIN = os.environ.get('VIM_BIN_NAME', 'vim')
+assert VIM_BIN in ('vim', 'nvim')
+# `-i NONE -n`: don't read or write viminfo/shada, and don't create swap files.
+VIM_ARGS = [VIM_BIN, '-u', 'vimrc', '-i', 'NONE', '-n']
+if VIM_BIN == 'vim':
+    # Otherwise, vim waits for two seconds on startup, warning that output is
+    # not to a terminal.
+    VIM_ARGS.append('--not-a-term')
+# The output of vim is discarded to /dev/null, opened once rather than per run.
+DEVNULL_FD = os.open(os.devnull, os.O_WRONLY)
+atexit.register(os.close, DEVNULL_FD)
+
+
+def make_scratch_dir() -> Path:
+    # Generated tests live only until vim has run them, so write them to the
+    # RAM-backed /dev/shm when available. Failing ones are moved to `cases/`.
+    shm = Path('/dev/shm')
+    shm = shm if shm.is_dir() and os.access(shm, os.W_OK) else None
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'main')
+    scratch_dir = Path(
+        tempfile.mkdtemp(prefix=f'jieba_vim_cases_{worker}_', dir=shm))
+    atexit.register(shutil.rmtree, scratch_dir, ignore_errors=True)
+    return scratch_dir
+
+
+SCRATCH_DIR = make_scratch_dir()
+
+# Names of generated tests are numbered, rather than uuid4, which reads random
+# bytes from the OS on every call. The prefix keeps the names unique across
+# runs, as failing tests are moved to `cases/`.
+CASE_NAME_PREFIX = f'{os.getpid()}_{int(time.time())}_'
+CASE_NUMBERS = itertools.count()
+
+
+@st.composite
+def the_strategy(draw):
+    paragraph_st = st.text(alphabet='a, \n', min_size=1)
     mode_st = st.sampled_from(['n', 'o', 'xchar', 'xline', 'xblock'])
     simple_move_st = st.sampled_from(['h', 'j', 'k', 'l'])
     basic_jieba_motion_st = st.sampled_from(
         ['w', 'W', 'e', 'E', 'b', 'B', 'ge', 'gE'])
-    count_st = paragraph_st.flatmap(
-        lambda para: st.integers(min_value=1, max_value=len(para)))
+
+    paragraph = draw(paragraph_st)
+    # Counts are bounded by the length of the paragraph being tested.
+    count_st = st.integers(min_value=1, max_value=len(paragraph))
     count_jieba_motion_st = st.tuples(
         count_st, basic_jieba_motion_st).map(lambda x: f'{x[0]}{x[1]}')
     jieba_motion_st = st.one_of(basic_jieba_motion_st, count_jieba_motion_st)
 
-    def just_singleton_list(e):
-        return st.lists(st.just(e), min_size=1, max_size=1)
-
-    def cat(*lists_st):
-        def cat_lists(lists):
-            r = []
-            for l in lists:
-                r.extend(l)
-            return r
-
-        return st.tuples(*lists_st).map(cat_lists)
-
-    def generate_based_on_mode(mode):
-        if mode == 'n':
-            setup_key_seq_st = st.lists(simple_move_st)
-            jieba_key_seq_st = st.lists(jieba_motion_st, min_size=1)
-            teardown_key_seq_st = st.just(None)
-        elif mode == 'o':
-            setup_key_seq_st = st.lists(simple_move_st)
-            jieba_key_seq_st = cat(
-                just_singleton_list('"xy'),
-                st.lists(jieba_motion_st, min_size=1, max_size=1))
-            teardown_key_seq_st = st.just(None)
-        elif mode == 'xchar':
-            setup_key_seq_st = cat(
-                st.lists(simple_move_st), just_singleton_list('v'),
-                st.lists(simple_move_st))
-            jieba_key_seq_st = st.lists(jieba_motion_st, min_size=1)
-            teardown_key_seq_st = just_singleton_list('"xy')
-        elif mode == 'xline':
-            setup_key_seq_st = cat(
-                st.lists(simple_move_st), just_singleton_list('V'),
-                st.lists(simple_move_st))
-            jieba_key_seq_st = st.lists(jieba_motion_st, min_size=1)
-            teardown_key_seq_st = just_singleton_list('"xy')
-        else:
-            setup_key_seq_st = cat(
-                st.lists(simple_move_st),
-                st.just(['\\<C-v>']),
-                st.lists(simple_move_st),
-            )
-            jieba_key_seq_st = st.lists(jieba_motion_st, min_size=1)
-            teardown_key_seq_st = just_singleton_list('"xy')
-        return st.tuples(paragraph_st, st.just(mode), setup_key_seq_st,
-                         jieba_key_seq_st, teardown_key_seq_st)
-
-    return mode_st.flatmap(generate_based_on_mode)
+    mode = draw(mode_st)
+    if mode == 'n':
+        setup_keys = draw(st.lists(simple_move_st))
+        jieba_keys = draw(st.lists(jieba_motion_st, min_size=1))
+        teardown_keys = None
+    elif mode == 'o':
+        setup_keys = draw(st.lists(simple_move_st))
+        jieba_keys = ['"xy', draw(jieba_motion_st)]
+        teardown_keys = None
+    else:
+        visual_key = {'xchar': 'v', 'xline': 'V', 'xblock': '\\<C-v>'}[mode]
+        setup_keys = draw(st.lists(simple_move_st))
+        setup_keys.append(visual_key)
+        setup_keys.extend(draw(st.lists(simple_move_st)))
+        jieba_keys = draw(st.lists(jieba_motion_st, min_size=1))
+        teardown_keys = ['"xy']
+    return paragraph, mode, setup_keys, jieba_keys, teardown_keys
 
 
 class VaderBlock:
-    def __init__(self, outfile: ty.TextIO, label: str, comment: str = ''):
-        self.outfile = outfile
+    def __init__(self, buf: list[str], label: str, comment: str = ''):
+        self.buf = buf
         self.label = label
         self.comment = comment or None
 
     def __enter__(self):
         if self.comment:
-            self.outfile.write(f'{self.label} ({self.comment}):\n')
+            self.buf.append(f'{self.label} ({self.comment}):\n')
         else:
-            self.outfile.write(f'{self.label}:\n')
+            self.buf.append(f'{self.label}:\n')
         return self
 
     def print(self, string: str = ''):
         if string:
-            self.outfile.write(f'  {string}\n')
+            self.buf.append(f'  {string}\n')
         else:
-            self.outfile.write('\n')
+            self.buf.append('\n')
 
     def __exit__(self, _a, _b, _c):
-        self.outfile.write('\n')
+        self.buf.append('\n')
 
 
-@contextlib.contextmanager
-def write_vader_hooks(
-    outfile: ty.TextIO,
-    mode: str,
-):
+# The hooks depend only on the map mode, so render them once per mode.
+@functools.lru_cache(maxsize=None)
+def render_vader_hooks(map_mode: str) -> str:
+    buf = []
     jieba_keys = ['w', 'W', 'e', 'E', 'b', 'B', 'ge', 'gE']
-    with VaderBlock(outfile, 'Before') as block:
-        block.print(f'Log "{mode[0]}map jieba keys"')
+    with VaderBlock(buf, 'Before') as block:
+        block.print(f'Log "{map_mode}map jieba keys"')
         for k in jieba_keys:
-            block.print(f'{mode[0]}map {k} <Plug>(Jieba_{k})')
-    with VaderBlock(outfile, 'After') as block:
-        block.print(f'Log "{mode[0]}unmap jieba keys"')
+            block.print(f'{map_mode}map {k} <Plug>(Jieba_{k})')
+    with VaderBlock(buf, 'After') as block:
+        block.print(f'Log "{map_mode}unmap jieba keys"')
         for k in jieba_keys:
-            block.print(f'{mode[0]}unmap {k}')
-    yield
-    with VaderBlock(outfile, 'Before'):
-        pass
-    with VaderBlock(outfile, 'After'):
-        pass
+            block.print(f'{map_mode}unmap {k}')
+    return ''.join(buf)
 
 
-def write_vader_given_block(outfile: ty.TextIO, paragraph: list[str]):
-    with VaderBlock(outfile, 'Given') as block:
-        for line in ''.join(paragraph).splitlines():
+def write_vader_given_block(buf: list[str], paragraph: str):
+    with VaderBlock(buf, 'Given') as block:
+        for line in paragraph.splitlines():
             block.print(line)
 
 
-def write_key_sequence(block: VaderBlock, keys: list[str], bang: bool = True):
-    if bang:
-        for key in keys:
-            block.print(f'normal! {key}')
-    else:
-        for key in keys:
-            block.print(f'normal {key}')
-
-
-def write_vader_execute_then_block(
-    outfile: ty.TextIO,
-    mode: str,
-    setup_keys: list[str] | None,
-    jieba_keys: list[str] | None,
-    teardown_keys: list[str] | None,
-):
-    if mode[0] == 'n':
-        with VaderBlock(outfile, 'Execute') as block:
+def render_key_sequence(keys: list[str], bang: bool = True) -> str:
+    # One `normal` per key, since a failing key (e.g. `h` at column 1) aborts
+    # the rest of the keys of a `normal`.
+    normal = 'normal!' if bang else 'normal'
+    lines = []
+    for key in keys:
+        if '\\<' in key:
+            # Special keys like `\<C-v>` are expanded only in double-quoted
+            # strings, hence `execute`.
+            lines.append(f'  execute "{normal} {key}"\n')
+        else:
+            lines.append(f'  {normal} {key}\n')
+    return ''.join(lines)
+
+
+# The Execute/Then blocks differ across tests of the same map mode only in the
+# key sequences, so render them once per mode as a template, with the key
+# sequences left as `str.format` fields.
+@functools.lru_cache(maxsize=None)
+def render_vader_execute_then_template(map_mode: str) -> str:
+    buf = []
+    if map_mode == 'n':
+        with VaderBlock(buf, 'Execute') as block:
             # Record ground truth
             block.print('normal! gg0')
-            write_key_sequence(block, setup_keys)
-            write_key_sequence(block, jieba_keys)
+            buf.append('{setup}{jieba}')
             block.print('let g:proptest_groundtruth_line_after = line(".")')
             block.print('let g:proptest_groundtruth_col_after = col(".")')
             # Record jieba
             block.print('normal! gg0')
-            write_key_sequence(block, setup_keys)
-            write_key_sequence(block, jieba_keys, bang=False)
+            buf.append('{setup}{jieba_remap}')
             block.print('let g:proptest_jieba_line_after = line(".")')
             block.print('let g:proptest_jieba_col_after = col(".")')
-        with VaderBlock(outfile, 'Then') as block:
+        with VaderBlock(buf, 'Then') as block:
             block.print('AssertEqual '
                         'g:proptest_groundtruth_line_after, '
                         'g:proptest_jieba_line_after')
             block.print('AssertEqual '
                         'g:proptest_groundtruth_col_after, '
                         'g:proptest_jieba_col_after')
-    elif mode[0] == 'o':
-        with VaderBlock(outfile, 'Execute') as block:
+    elif map_mode == 'o':
+        with VaderBlock(buf, 'Execute') as block:
             # Record groundtruth
             block.print('normal! gg0')
-            write_key_sequence(block, setup_keys)
-            write_key_sequence(block, jieba_keys)
+            buf.append('{setup}{jieba}')
             block.print('let g:propttest_groundtruth_yanked = @x')
             # Record jieba
             block.print('normal! gg0')
-            write_key_sequence(block, setup_keys)
-            write_key_sequence(block, jieba_keys, bang=False)
+            buf.append('{setup}{jieba_remap}')
             block.print('let g:proptest_jieba_yanked = @x')
-        with VaderBlock(outfile, 'Then') as block:
+        with VaderBlock(buf, 'Then') as block:
             block.print('AssertEqual '
                         'g:propttest_groundtruth_yanked, '
                         'g:proptest_jieba_yanked')
     else:
-        with VaderBlock(outfile, 'Execute') as block:
+        with VaderBlock(buf, 'Execute') as block:
             # Record groundtruth
             block.print('normal! gg0')
-            write_key_sequence(block, setup_keys)
-            write_key_sequence(block, jieba_keys)
-            write_key_sequence(block, teardown_keys)
+            buf.append('{setup}{jieba}{teardown}')
             block.print(
                 '''let g:proptest_groundtruth_lline_after = line("'<")''')
             block.print(
@@ -198,15 +200,13 @@ def write_vader_execute_then_block(
             block.print('let g:proptest_groundtruth_yanked = @x')
             # Record jieba
             block.print('normal! gg0')
-            write_key_sequence(block, setup_keys)
-            write_key_sequence(block, jieba_keys, bang=False)
-            write_key_sequence(block, teardown_keys)
+            buf.append('{setup}{jieba_remap}{teardown}')
             block.print('''let g:proptest_jieba_lline_after = line("'<")''')
             block.print('''let g:proptest_jieba_lcol_after = col("'<")''')
             block.print('''let g:proptest_jieba_rline_after = line("'>")''')
             block.print('''let g:proptest_jieba_rcol_after = col("'>")''')
             block.print('let g:proptest_jieba_yanked = @x')
-        with VaderBlock(outfile, 'Then') as block:
+        with VaderBlock(buf, 'Then') as block:
             gt_vars = [
                 'g:proptest_groundtruth_lline_after',
                 'g:proptest_groundtruth_lcol_after',
@@ -223,10 +223,25 @@ def write_vader_execute_then_block(
             ]
             for gv, jv in zip(gt_vars, jieba_vars):
                 block.print(f'AssertEqual {gv}, {jv}')
+    return ''.join(buf)
+
+
+def write_vader_execute_then_block(
+    buf: list[str],
+    mode: str,
+    setup_keys: list[str] | None,
+    jieba_keys: list[str] | None,
+    teardown_keys: list[str] | None,
+):
+    buf.append(render_vader_execute_then_template(mode[0]).format(
+        setup=render_key_sequence(setup_keys),
+        jieba=render_key_sequence(jieba_keys),
+        jieba_remap=render_key_sequence(jieba_keys, bang=False),
+        teardown=render_key_sequence(teardown_keys or [])))
 
 
 def write_vader_test(
-    paragraph: list[str],
+    paragraph: str,
     mode: str,
     setup_keys: list[str] | None,
     jieba_keys: list[str] | None,
@@ -234,58 +249,185 @@ def write_vader_test(
     name: Path | None = None,
 ) -> Path:
     if name is None:
-        name = Path('cases') / (str(uuid.uuid4()) + '.vader')
+        name = SCRATCH_DIR / f'{CASE_NAME_PREFIX}{next(CASE_NUMBERS)}.vader'
+    buf = [render_vader_hooks(mode[0])]
+    write_vader_given_block(buf, paragraph)
+    write_vader_execute_then_block(buf, mode, setup_keys, jieba_keys,
+                                   teardown_keys)
     with open(name, 'w', encoding='utf-8') as outfile:
-        with write_vader_hooks(outfile, mode):
-            write_vader_given_block(outfile, paragraph)
-            write_vader_execute_then_block(outfile, mode, setup_keys,
-                                           jieba_keys, teardown_keys)
+        outfile.write(''.join(buf))
     return name
 
 
-def eval_with_vim(vader_test_file: Path, unlink_on_success: bool = True):
-    vim_bin = os.environ.get('VIM_BIN_NAME', 'vim')
-    assert vim_bin in ('vim', 'nvim')
+def run_vader(vader_test_files: list[Path], timeout: float):
+    files = ' '.join(map(str, vader_test_files))
+    subprocess.run(VIM_ARGS + ['-c', f'silent Vader! {files}'],
+                   check=True,
+                   stdout=DEVNULL_FD,
+                   stderr=DEVNULL_FD,
+                   timeout=timeout)
+
+
+def keep_failed_case(vader_test_file: Path) -> Path:
+    Path('cases').mkdir(exist_ok=True, parents=False)
+    return Path(
+        shutil.move(vader_test_file, Path('cases') / vader_test_file.name))
+
+
+def vader_verdict(vader_test_file: Path) -> str | None:
     try:
-        subprocess.run(
-            [vim_bin, '-u', 'vimrc', '-c', f'silent Vader! {vader_test_file}'],
-            check=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            timeout=10)
-        if unlink_on_success:
-            vader_test_file.unlink()
+        run_vader([vader_test_file], timeout=10)
     except subprocess.CalledProcessError:
-        assert False, 'wrong result'
+        return 'wrong result'
     except subprocess.TimeoutExpired:
-        assert False, 'timeout'
+        return 'timeout'
+    return None
+
+
+# Verdicts of generated tests by their input: None if passed, otherwise the
+# failure message. Hypothesis may draw the same input more than once (e.g.
+# while shrinking), which then needn't be run by vim again.
+VERDICTS: dict[tuple, str | None] = {}
+
+# The number of generated tests may be set by PROPTEST_MAX_EXAMPLES. Setting
+# PROPTEST_NO_SHRINK skips shrinking failing tests, which runs vim many times,
+# for quick runs (e.g. in CI).
+MAX_EXAMPLES = int(
+    os.environ.get('PROPTEST_MAX_EXAMPLES',
+                   hypothesis.settings().max_examples))
+PHASES = hypothesis.settings().phases
+if os.environ.get('PROPTEST_NO_SHRINK'):
+    PHASES = tuple(p for p in PHASES if p != hypothesis.Phase.shrink)
+
+# Under pytest-xdist (e.g. `pytest -n auto`), the generated tests are split
+# into one shard per worker, each running its share of the examples.
+SHARDS = max(
+    1, min(int(os.environ.get('PYTEST_XDIST_WORKER_COUNT', '1')),
+           MAX_EXAMPLES))
+
+# Inputs always tested, by the first shard only.
+EXPLICIT_EXAMPLES = (
+    ('a', 'n', [], ['102039494923949w'], None),
+    ('a', 'xchar', ['v'], ['w'], ['"xy']),
+    ('a', 'o', [], ['"xy', 'w'], None),
+    (',,,', 'n', [], ['w'], None),
+    ('aa', 'n', [], ['b', 'w'], None),
+    ('aa', 'xchar', ['v'], ['w', 'ge'], ['"xy']),
+)
+
+
+def check_jieba_en(args):
+    key = tuple(tuple(a) if isinstance(a, list) else a for a in args)
+    if key not in VERDICTS:
+        paragraph, mode, setup_keys, jieba_keys, teardown_keys = args
+        vader_test_file = write_vader_test(paragraph, mode, setup_keys,
+                                           jieba_keys, teardown_keys)
+        verdict = vader_verdict(vader_test_file)
+        if verdict is None:
+            vader_test_file.unlink()
+        else:
+            verdict = f'{verdict}: {keep_failed_case(vader_test_file)}'
+        VERDICTS[key] = verdict
+    assert VERDICTS[key] is None, VERDICTS[key]
+
+
+def make_test_jieba_en(name: str,
+                       max_examples: int,
+                       with_explicit_examples: bool,
+                       parent: hypothesis.settings | None = None):
+    def _test_jieba_en(args):
+        check_jieba_en(args)
+
+    # Shards share the source of `_test_jieba_en`, and thus the digest by which
+    # Hypothesis seeds a derandomized run and keys its example database. Give
+    # each shard its own digest, as Hypothesis's pytest plugin does for
+    # parametrized tests, so that shards don't draw the same examples.
+    _test_jieba_en.__name__ = _test_jieba_en.__qualname__ = name
+    _test_jieba_en._hypothesis_internal_add_digest = name.encode()
+    if with_explicit_examples:
+        for args in reversed(EXPLICIT_EXAMPLES):
+            _test_jieba_en = hypothesis.example(args)(_test_jieba_en)
+    _test_jieba_en = hypothesis.settings(parent,
+                                         deadline=None,
+                                         max_examples=max_examples,
+                                         phases=PHASES)(_test_jieba_en)
+    return hypothesis.given(the_strategy())(_test_jieba_en)
+
+
+def add_test_jieba_en():
+    if SHARDS == 1:
+        return {
+            'test_jieba_en':
+            make_test_jieba_en('test_jieba_en', MAX_EXAMPLES, True)
+        }
+    # The first `extra` shards run one more example, so that the shards run
+    # MAX_EXAMPLES in total.
+    per_shard, extra = divmod(MAX_EXAMPLES, SHARDS)
+    tests = {}
+    for shard in range(SHARDS):
+        name = f'test_jieba_en_{shard}'
+        tests[name] = make_test_jieba_en(name, per_shard + (shard < extra),
+                                         shard == 0)
+    return tests
+
+
+globals().update(**add_test_jieba_en())
+
+
+def test_shards_draw_different_examples(monkeypatch):
+    # Under `derandomize=True` (e.g. in Hypothesis's `ci` profile), shards must
+    # not draw the same examples, except for the simplest one, which Hypothesis
+    # tries first in every run.
+    drawn = [set(), set()]
+    shard = 0
+
+    def record(args):
+        drawn[shard].add(repr(args))
+
+    monkeypatch.setitem(globals(), 'check_jieba_en', record)
+    parent = hypothesis.settings(derandomize=True, database=None)
+    for shard in range(2):
+        make_test_jieba_en(f'test_jieba_en_{shard}', 50, False, parent)()
+    assert len(drawn[0] & drawn[1]) <= 1
+
+
+def list_named_cases() -> list[Path]:
+    named_cases = Path('named_cases')
+    if named_cases.is_dir():
+        return sorted(named_cases.iterdir())
+    return []
 
 
-@hypothesis.given(the_strategy())
-@hypothesis.settings(deadline=None)
-@hypothesis.example((['a'], 'n', [], ['102039494923949w'], None))
-@hypothesis.example((['a'], 'xchar', ['v'], ['w'], ['"xy']))
-@hypothesis.example((['a'], 'o', [], ['"xy', 'w'], None))
-@hypothesis.example(([',', ',', ','], 'n', [], ['w'], None))
-@hypothesis.example((['a', 'a'], 'n', [], ['b', 'w'], None))
-@hypothesis.example((['a', 'a'], 'xchar', ['v'], ['w', 'ge'], ['"xy']))
-def test_jieba_en(args):
-    paragraph, mode, setup_keys, jieba_keys, teardown_keys = args
-    vader_test_file = write_vader_test(paragraph, mode, setup_keys, jieba_keys,
-                                       teardown_keys)
-    eval_with_vim(vader_test_file)
+@pytest.fixture(scope='module')
+def named_case_verdicts() -> dict[Path, str | None]:
+    # Run all named cases in one vim, so that vim starts once rather than once
+    # per case.
+    vader_test_files = list_named_cases()
+    try:
+        run_vader(vader_test_files, timeout=10 * len(vader_test_files))
+        return dict.fromkeys(vader_test_files)
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+        pass
+    # Rerun each case on its own to find out which cases fail.
+    return {f: vader_verdict(f) for f in vader_test_files}
 
 
-def add_named_cases():
-    cases = {}
-    named_cases = Path('named_cases')
-    if named_cases.is_dir():
-        for vader_test_file in named_cases.iterdir():
+def make_named_case(vader_test_file: Path):
+    # All named cases go to the same xdist worker (with `--dist loadgroup`), so
+    # that `named_case_verdicts` runs them in one vim once per session.
+    @pytest.mark.xdist_group('named_cases')
+    def _named_case(named_case_verdicts):
+        verdict = named_case_verdicts[vader_test_file]
+        assert verdict is None, f'{verdict}: {vader_test_file}'
 
-            def _named_case():
-                eval_with_vim(vader_test_file, unlink_on_success=False)
+    return _named_case
 
-            cases[f'test_{vader_test_file.stem}'] = _named_case
+
+def add_named_cases():
+    cases = {}
+    for vader_test_file in list_named_cases():
+        cases[f'test_{vader_test_file.stem}'] = make_named_case(
+            vader_test_file)
     return cases
 
 